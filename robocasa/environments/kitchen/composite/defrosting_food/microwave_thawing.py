@@ -1,4 +1,4 @@
-from robocasa.environments.kitchen.kitchen import *
+from robocasa.environments.kitchen.kitchen import Kitchen, FixtureType, OU
 
 
 class MicrowaveThawing(Kitchen):
@@ -15,6 +15,40 @@ class MicrowaveThawing(Kitchen):
     # exclude layout 9 because the microwave is far from counters
     EXCLUDE_LAYOUTS = [9]
 
+    # static parts of the object configs; per-episode fixture references are
+    # merged in by _get_obj_cfgs, which runs on every reset
+    _OBJ_CFGS_TEMPLATE = (
+        dict(
+            name="obj",
+            obj_groups="food",
+            graspable=True,
+            microwavable=True,
+            freezable=True,
+            placement=dict(
+                size=(0.30, 0.30),
+                pos=("ref", -1.0),
+                try_to_place_in="container",
+            ),
+        ),
+        dict(
+            name="container",
+            obj_groups=("plate"),
+            placement=dict(
+                size=(0.05, 0.05),
+                ensure_object_boundary_in_range=False,
+            ),
+        ),
+        # distractors
+        dict(
+            name="distr_counter",
+            obj_groups="all",
+            placement=dict(
+                size=(0.50, 0.20),
+                pos=(0, 1.0),
+            ),
+        ),
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -52,55 +86,31 @@ class MicrowaveThawing(Kitchen):
         return ep_meta
 
     def _get_obj_cfgs(self):
-        cfgs = []
-
-        cfgs.append(
+        # merge the per-episode fixture references into the static template via
+        # shallow dict merges (fresh outer/placement dicts, no deepcopy)
+        obj_t, container_t, distr_t = self._OBJ_CFGS_TEMPLATE
+        return [
             dict(
-                name="obj",
-                obj_groups="food",
-                graspable=True,
-                microwavable=True,
-                freezable=True,
+                obj_t,
                 placement=dict(
+                    obj_t["placement"],
                     fixture=self.counter,
-                    sample_region_kwargs=dict(
-                        ref=self.microwave,
-                    ),
-                    size=(0.30, 0.30),
-                    pos=("ref", -1.0),
-                    try_to_place_in="container",
+                    sample_region_kwargs=dict(ref=self.microwave),
                 ),
-            )
-        )
-        cfgs.append(
+            ),
             dict(
-                name="container",
-                obj_groups=("plate"),
-                placement=dict(
-                    fixture=self.microwave,
-                    size=(0.05, 0.05),
-                    ensure_object_boundary_in_range=False,
-                ),
-            )
-        )
-
-        # distractors
-        cfgs.append(
+                container_t,
+                placement=dict(container_t["placement"], fixture=self.microwave),
+            ),
             dict(
-                name="distr_counter",
-                obj_groups="all",
+                distr_t,
                 placement=dict(
+                    distr_t["placement"],
                     fixture=self.distr_counter,
-                    sample_region_kwargs=dict(
-                        ref=self.microwave,
-                    ),
-                    size=(0.50, 0.20),
-                    pos=(0, 1.0),
+                    sample_region_kwargs=dict(ref=self.microwave),
                 ),
-            )
-        )
-
-        return cfgs
+            ),
+        ]
 
     def _check_success(self):
         obj_in_microwave = OU.obj_inside_of(self, "obj", self.microwave)
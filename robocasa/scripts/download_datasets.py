@@ -1,8 +1,14 @@
 import argparse
 import json
 import os
+import queue
+import shutil
 import tarfile
+import tempfile
+import threading
+import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from termcolor import colored
@@ -23,6 +29,15 @@ BOX_LINKS_DS_PATH = os.path.join(
 with open(BOX_LINKS_DS_PATH, "r") as f:
     BOX_LINKS_DS = json.load(f)
 
+# buffer size for tar stream reads and member copies (tarfile defaults to 16 KiB)
+TAR_COPY_BUFSIZE = 4 * 1024 * 1024
+
+# concurrent downloads; capped to avoid tripping Box's per-IP throttling
+MAX_DOWNLOAD_WORKERS = 4
+
+# read size for chunked downloads (urlretrieve's 8 KiB default is far too small)
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
 
 def _get_direct_download_url(shared_url, ext="tar"):
     """
@@ -35,11 +50,34 @@ def _get_direct_download_url(shared_url, ext="tar"):
     return f"{base}/shared/static/{shared_id}.{ext}"
 
 
-class DownloadProgressBar(tqdm):
-    def update_to(self, b=1, bsize=1, tsize=None):
-        if tsize is not None:
-            self.total = tsize
-        self.update(b * bsize - self.n)
+def _extract_tar(tar, path):
+    """extractall with an explicit filter, avoiding the slower 3.12+ default.
+
+    "data" does the safety checks we actually want without the extra
+    per-member Python work of the default filter selection.
+    """
+    try:
+        tar.extractall(path=path, filter="data")
+    except TypeError:
+        # filter= not available on older Pythons
+        tar.extractall(path=path)
+
+
+class _ProgressReader:
+    """File-like proxy that forwards reads to @fileobj and updates a tqdm bar.
+
+    Used to report progress while streaming an HTTP response directly into
+    tarfile, where there is no intermediate file to watch.
+    """
+
+    def __init__(self, fileobj, pbar):
+        self._fileobj = fileobj
+        self._pbar = pbar
+
+    def read(self, size=-1):
+        chunk = self._fileobj.read(size)
+        self._pbar.update(len(chunk))
+        return chunk
 
 
 def download_url(url, download_dir, fname=None, check_overwrite=True):
@@ -62,12 +100,119 @@ def download_url(url, download_dir, fname=None, check_overwrite=True):
 
     print(colored(f"Downloading to {file_to_write}", "yellow"))
 
-    with DownloadProgressBar(unit="B", unit_scale=True, miniters=1, desc=fname) as t:
-        urllib.request.urlretrieve(url, filename=file_to_write, reporthook=t.update_to)
+    # chunked urlopen read loop: urlretrieve reads 8 KiB at a time, which is
+    # needlessly slow on fast links
+    with urllib.request.urlopen(url) as resp, open(
+        file_to_write, "wb", buffering=0
+    ) as out:
+        total = int(resp.headers.get("Content-Length") or 0)
+        with tqdm(
+            unit="B", unit_scale=True, miniters=1, desc=fname, total=total or None
+        ) as pbar:
+            while True:
+                chunk = resp.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+                pbar.update(len(chunk))
+
+
+def download_url_ranged(url, path, n_conns=4, pbar_position=None):
+    """
+    Downloads @url to @path using @n_conns parallel HTTP Range requests, for
+    servers where a single TCP stream is bandwidth-capped. @pbar_position pins
+    the shared progress bar to a fixed terminal row (see
+    download_and_extract_from_box).
+
+    Returns:
+        True on success; False if the server does not honor byte ranges or
+        report a total length, or rejects the probe outright (callers should
+        fall back to a single stream).
+    """
+    # Probe with a one-byte range GET rather than HEAD: urllib's redirect
+    # handler re-issues redirected requests as plain GETs, so a HEAD against
+    # Box's redirecting shared/static links would open a full-body download.
+    # A 206 both confirms range support and carries the total length in
+    # Content-Range ("bytes 0-0/<total>").
+    try:
+        probe_req = urllib.request.Request(url, headers={"Range": "bytes=0-0"})
+        with urllib.request.urlopen(probe_req) as resp:
+            if resp.status != 206:
+                # 200 means the server ignored the Range header
+                return False
+            content_range = resp.headers.get("Content-Range") or ""
+            total = int(content_range.rpartition("/")[2])
+    except (urllib.error.URLError, OSError, ValueError):
+        # uncooperative server (or a "*" length); degrade to a single stream
+        return False
+    if total == 0:
+        return False
+
+    n_conns = max(1, min(int(n_conns), total))
+    fd = os.open(path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+    try:
+        # preallocate so each worker can pwrite into its own offsets
+        try:
+            os.posix_fallocate(fd, 0, total)
+        except (AttributeError, OSError):
+            os.ftruncate(fd, total)
+
+        bounds = [total * i // n_conns for i in range(n_conns + 1)]
+        errors = []
+        pbar_lock = threading.Lock()
+        with tqdm(
+            unit="B",
+            unit_scale=True,
+            miniters=1,
+            desc=os.path.basename(path),
+            total=total,
+            position=pbar_position,
+            leave=pbar_position is None,
+        ) as pbar:
+
+            def _fetch(lo, hi):
+                try:
+                    req = urllib.request.Request(
+                        url, headers={"Range": f"bytes={lo}-{hi - 1}"}
+                    )
+                    with urllib.request.urlopen(req) as resp:
+                        offset = lo
+                        while offset < hi:
+                            chunk = resp.read(min(DOWNLOAD_CHUNK_SIZE, hi - offset))
+                            if not chunk:
+                                raise IOError(
+                                    f"range {lo}-{hi - 1} ended early at {offset}"
+                                )
+                            os.pwrite(fd, chunk, offset)
+                            offset += len(chunk)
+                            with pbar_lock:
+                                pbar.update(len(chunk))
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [
+                threading.Thread(target=_fetch, args=(bounds[i], bounds[i + 1]))
+                for i in range(n_conns)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        if errors:
+            raise errors[0]
+    finally:
+        os.close(fd)
+    return True
 
 
 def download_datasets(
-    split, tasks, source, all_data=False, overwrite=False, dryrun=False
+    split,
+    tasks,
+    source,
+    all_data=False,
+    overwrite=False,
+    dryrun=False,
+    parallel_conns=1,
 ):
 
     if all_data:
@@ -78,6 +223,9 @@ def download_datasets(
     if tasks is None:
         tasks = list(ATOMIC_TASK_DATASETS.keys()) + list(COMPOSITE_TASK_DATASETS.keys())
 
+    # collect the paths to pull, then download them in parallel: each tarball is
+    # network-bound, so a small thread pool overlaps the per-task downloads
+    ds_paths = []
     for task_name in tasks:
         for sp in split:
             for src in source:
@@ -107,17 +255,43 @@ def download_datasets(
                     )
                     continue
 
-                if not dryrun:
-                    download_and_extract_from_box(
-                        destination=ds_path,
-                    )
-                else:
+                if dryrun:
                     print(colored(f"Would download to {ds_path}", "cyan"))
+                else:
+                    ds_paths.append(ds_path)
                 print()
 
+    if ds_paths:
+        # each in-flight download gets its own progress-bar row so concurrent
+        # tqdm bars don't interleave; rows are recycled as tasks finish
+        pbar_rows = queue.SimpleQueue()
+        for row in range(MAX_DOWNLOAD_WORKERS):
+            pbar_rows.put(row)
+
+        def _download(ds_path):
+            row = pbar_rows.get()
+            try:
+                download_and_extract_from_box(
+                    ds_path, n_conns=parallel_conns, pbar_position=row
+                )
+            finally:
+                pbar_rows.put(row)
+
+        with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as ex:
+            list(ex.map(_download, ds_paths))
+
 
-def download_and_extract_from_box(destination):
-    """Download a tar file from Box and extract it to the destination path."""
+def download_and_extract_from_box(destination, n_conns=1, pbar_position=None):
+    """Download a tar file from Box and extract it to the destination path.
+
+    With n_conns > 1 the tar is fetched via parallel HTTP Range requests to a
+    scratch file before extraction (when the server supports byte ranges);
+    otherwise the response is streamed straight into tarfile.
+
+    @pbar_position pins the progress bar to a fixed terminal row; it is set
+    when several downloads run concurrently so their bars don't interleave
+    (status messages then go through tqdm.write, which redraws cleanly).
+    """
     ds_path = Path(destination)
     if DATASET_BASE_PATH is not None:
         base_datasets_path = Path(DATASET_BASE_PATH) / "v1.0"
@@ -129,7 +303,7 @@ def download_and_extract_from_box(destination):
     tar_key = str(relative_path.parent / f"{relative_path.name}.tar")
 
     if tar_key not in BOX_LINKS_DS:
-        print(colored(f"No Box link found for '{tar_key}' - skipping.", "red"))
+        tqdm.write(colored(f"No Box link found for '{tar_key}' - skipping.", "red"))
         return
 
     shared_url = BOX_LINKS_DS[tar_key]
@@ -138,38 +312,76 @@ def download_and_extract_from_box(destination):
     extract_dir = ds_path.parent
     os.makedirs(extract_dir, exist_ok=True)
 
-    tar_download_path = os.path.join(str(extract_dir), f"{relative_path.name}.tar")
-
-    print(colored(f"Downloading {tar_key} from Box...", "green"))
+    tqdm.write(colored(f"Downloading and extracting {tar_key} from Box...", "green"))
 
+    # stream the HTTP response directly into tarfile so extraction overlaps the
+    # download and no scratch tar file ever hits the disk. Extraction goes to a
+    # staging dir that is renamed into place on success: a mid-transfer failure
+    # must never leave a partial tree at ds_path, since later runs treat an
+    # existing ds_path as a complete dataset and skip it.
+    tar_download_path = os.path.join(str(extract_dir), f"{relative_path.name}.tar")
     download_success = False
     for i in range(3):
+        staging_dir = tempfile.mkdtemp(
+            prefix=f".{relative_path.name}.partial-", dir=str(extract_dir)
+        )
         try:
-            download_url(
-                url=download_url_str,
-                download_dir=str(extract_dir),
-                fname=f"{relative_path.name}.tar",
-                check_overwrite=False,
-            )
+            if n_conns > 1 and download_url_ranged(
+                download_url_str,
+                tar_download_path,
+                n_conns=n_conns,
+                pbar_position=pbar_position,
+            ):
+                with tarfile.open(
+                    tar_download_path, "r", copybufsize=TAR_COPY_BUFSIZE
+                ) as tar:
+                    _extract_tar(tar, staging_dir)
+                os.remove(tar_download_path)
+            else:
+                # single stream (also the fallback when ranges are unsupported)
+                with urllib.request.urlopen(download_url_str) as resp:
+                    total = int(resp.headers.get("Content-Length") or 0)
+                    with tqdm(
+                        unit="B",
+                        unit_scale=True,
+                        miniters=1,
+                        desc=f"{relative_path.name}.tar",
+                        total=total or None,
+                        position=pbar_position,
+                        leave=pbar_position is None,
+                    ) as pbar:
+                        reader = _ProgressReader(resp, pbar)
+                        # "r|" reads the stream sequentially and never seeks.
+                        # 4 MiB buffers (vs tarfile's 16 KiB default) cut
+                        # syscall/loop overhead substantially on multi-GB members.
+                        with tarfile.open(
+                            fileobj=reader,
+                            mode="r|",
+                            bufsize=TAR_COPY_BUFSIZE,
+                            copybufsize=TAR_COPY_BUFSIZE,
+                        ) as tar:
+                            _extract_tar(tar, staging_dir)
+
+            # fully extracted: move the tree(s) into the real extract dir
+            for entry in os.listdir(staging_dir):
+                dst_entry = os.path.join(str(extract_dir), entry)
+                if os.path.isdir(dst_entry) and not os.path.islink(dst_entry):
+                    shutil.rmtree(dst_entry)
+                os.replace(os.path.join(staging_dir, entry), dst_entry)
             download_success = True
             break
         except Exception as e:
-            print(f"Error downloading after try #{i + 1}: {e}")
+            tqdm.write(f"Error downloading after try #{i + 1}: {e}")
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
 
     if not download_success:
-        print("Failed to download. Try again...")
+        tqdm.write("Failed to download. Try again...")
         if os.path.exists(tar_download_path):
             os.remove(tar_download_path)
         return
 
-    print(colored(f"Extracting to {extract_dir}...", "green"))
-    with tarfile.open(tar_download_path, "r") as tar:
-        tar.extractall(path=extract_dir)
-
-    # clean up tar file
-    os.remove(tar_download_path)
-
-    print(colored(f"Done: {ds_path}", "green"))
+    tqdm.write(colored(f"Done: {ds_path}", "green"))
 
 
 if __name__ == "__main__":
@@ -218,6 +430,14 @@ if __name__ == "__main__":
         help="simulate without downloading datasets",
     )
 
+    parser.add_argument(
+        "--parallel-conns",
+        type=int,
+        default=1,
+        help="number of parallel HTTP connections per tarball (helps when a "
+        "single TCP stream is bandwidth-capped)",
+    )
+
     args = parser.parse_args()
 
     ans = input("This script may download several Gb of data. Proceed? (y/n) ")
@@ -234,4 +454,5 @@ if __name__ == "__main__":
         source=args.source,
         overwrite=args.overwrite,
         dryrun=args.dryrun,
+        parallel_conns=args.parallel_conns,
     )
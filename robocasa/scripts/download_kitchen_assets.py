@@ -1,4 +1,5 @@
 import argparse
+import functools
 import json
 import os
 import shutil
@@ -15,8 +16,12 @@ import robocasa
 BOX_LINKS_PATH = os.path.join(
     robocasa.__path__[0], "models", "assets", "box_links", "box_links_assets.json"
 )
-with open(BOX_LINKS_PATH, "r") as f:
-    BOX_LINKS = json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_box_links():
+    with open(BOX_LINKS_PATH, "r") as f:
+        return json.load(f)
 
 
 def _get_direct_download_url(shared_url):
@@ -30,53 +35,61 @@ def _get_direct_download_url(shared_url):
     return f"{base}/shared/static/{shared_id}.zip"
 
 
-DOWNLOAD_ASSET_REGISTRY = {
+# (message, box_links key, folder relative to the robocasa package) per asset
+# type; direct-download URLs are built lazily in _asset_config so importing this
+# module doesn't read box_links_assets.json or construct URLs for unused types
+_ASSET_SPECS = {
     ### textures ###
-    "tex": dict(
-        message="Downloading environment textures",
-        url=_get_direct_download_url(BOX_LINKS["textures"]),
-        folder=os.path.join(robocasa.__path__[0], "models/assets/textures"),
-        check_folder_exists=False,
+    "tex": (
+        "Downloading environment textures",
+        "textures",
+        "models/assets/textures",
     ),
-    "tex_generative": dict(
-        message="Downloading AI-generated environment textures",
-        url=_get_direct_download_url(BOX_LINKS["generative_textures"]),
-        folder=os.path.join(robocasa.__path__[0], "models/assets/generative_textures"),
-        check_folder_exists=False,
+    "tex_generative": (
+        "Downloading AI-generated environment textures",
+        "generative_textures",
+        "models/assets/generative_textures",
     ),
-    "fixtures_lw": dict(
-        message="Downloading lightwheel fixtures",
-        url=_get_direct_download_url(BOX_LINKS["fixtures_lightwheel"]),
-        folder=os.path.join(robocasa.__path__[0], "models/assets/fixtures"),
-        check_folder_exists=False,
+    "fixtures_lw": (
+        "Downloading lightwheel fixtures",
+        "fixtures_lightwheel",
+        "models/assets/fixtures",
     ),
     ### objects ###
-    "objs_objaverse": dict(
-        message="Downloading objaverse objects",
-        url=_get_direct_download_url(BOX_LINKS["objaverse"]),
-        folder=os.path.join(robocasa.__path__[0], "models/assets/objects/objaverse"),
-        check_folder_exists=False,
+    "objs_objaverse": (
+        "Downloading objaverse objects",
+        "objaverse",
+        "models/assets/objects/objaverse",
     ),
-    "objs_aigen": dict(
-        message="Downloading AI-generated objects",
-        url=_get_direct_download_url(BOX_LINKS["aigen_objs"]),
-        folder=os.path.join(robocasa.__path__[0], "models/assets/objects/aigen_objs"),
-        check_folder_exists=False,
+    "objs_aigen": (
+        "Downloading AI-generated objects",
+        "aigen_objs",
+        "models/assets/objects/aigen_objs",
     ),
-    "objs_lw": dict(
-        message="Downloading lightwheel objects",
-        url=_get_direct_download_url(BOX_LINKS["objects_lightwheel"]),
-        folder=os.path.join(robocasa.__path__[0], "models/assets/objects/lightwheel"),
-        check_folder_exists=False,
+    "objs_lw": (
+        "Downloading lightwheel objects",
+        "objects_lightwheel",
+        "models/assets/objects/lightwheel",
     ),
 }
 
+# static name list for argparse choices (no JSON read at import time)
+ASSET_TYPES = tuple(_ASSET_SPECS.keys())
+
+
+def _asset_config(name):
+    """Build the download_and_extract_zip kwargs for a single asset type."""
+    message, links_key, folder = _ASSET_SPECS[name]
+    return dict(
+        message=message,
+        url=_get_direct_download_url(_load_box_links()[links_key]),
+        folder=os.path.join(robocasa.__path__[0], folder),
+        check_folder_exists=False,
+    )
+
 
-class DownloadProgressBar(tqdm):
-    def update_to(self, b=1, bsize=1, tsize=None):
-        if tsize is not None:
-            self.total = tsize
-        self.update(b * bsize - self.n)
+# read size for chunked downloads (urlretrieve's 8 KiB default is far too small)
+DOWNLOAD_CHUNK_SIZE = 1 << 20
 
 
 def url_is_alive(url):
@@ -133,8 +146,21 @@ def download_url(url, download_dir, fname=None, check_overwrite=True):
 
     print(colored(f"Downloading to {file_to_write}", "yellow"))
 
-    with DownloadProgressBar(unit="B", unit_scale=True, miniters=1, desc=fname) as t:
-        urllib.request.urlretrieve(url, filename=file_to_write, reporthook=t.update_to)
+    # chunked urlopen read loop: urlretrieve reads 8 KiB at a time, which is
+    # needlessly slow on fast links
+    with urllib.request.urlopen(url) as resp, open(
+        file_to_write, "wb", buffering=0
+    ) as out:
+        total = int(resp.headers.get("Content-Length") or 0)
+        with tqdm(
+            unit="B", unit_scale=True, miniters=1, desc=fname, total=total or None
+        ) as pbar:
+            while True:
+                chunk = resp.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+                pbar.update(len(chunk))
 
 
 def download_and_extract_zip(
@@ -217,7 +243,7 @@ def download_kitchen_assets(types):
         print("Aborting.")
         return
 
-    for ds_name, config in DOWNLOAD_ASSET_REGISTRY.items():
+    for ds_name in ASSET_TYPES:
         if types is None:
             pass
         elif "all" in types:
@@ -226,7 +252,7 @@ def download_kitchen_assets(types):
         else:
             if ds_name not in types:
                 continue
-        download_and_extract_zip(**config)
+        download_and_extract_zip(**_asset_config(ds_name))
 
 
 if __name__ == "__main__":
@@ -235,7 +261,7 @@ if __name__ == "__main__":
         "--type",
         type=str,
         nargs="+",
-        choices=list(DOWNLOAD_ASSET_REGISTRY.keys()) + ["all"],
+        choices=list(ASSET_TYPES) + ["all"],
         help='asset registry types to download (specify "all" to download all types)',
     )
 
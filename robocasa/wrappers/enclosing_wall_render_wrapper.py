@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+import functools
+import queue
+import re
+import weakref
+from typing import Dict, Optional, Sequence, Tuple
 
 import numpy as np
 import yaml
 from robosuite.wrappers import Wrapper
 from pynput.keyboard import Key, Listener
 
+# prefer PyYAML's libyaml-backed loader (5-10x faster parse) when available
+try:
+    from yaml import CSafeLoader as _YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlSafeLoader
+
 import robocasa.models.scenes.scene_registry as SceneRegistry
 
 
@@ -64,6 +74,7 @@ class EnclosingWallHotkeyHandler:
     def __init__(self, env):
         self.env = env
         self._wrapper = _find_enclosing_wall_render_wrapper(env)
+        self._events = getattr(env, "_enclosing_wall_events", None)
 
     def consume_pending(self, *, render: bool) -> bool:
         """Apply and clear any queued wall hotkey requests.
@@ -71,24 +82,36 @@ class EnclosingWallHotkeyHandler:
         Returns:
             True if a request was consumed (callers typically `continue` their loop).
         """
-        force_opaque = bool(getattr(self.env, "_force_enclosing_walls_opaque", False))
-        toggle = bool(getattr(self.env, "_toggle_enclosing_walls", False))
-        if not force_opaque and not toggle:
+        events = self._events
+        if events is None:
+            # hotkeys may be installed after this handler was constructed
+            events = self._events = getattr(
+                self.env, "_enclosing_wall_events", None
+            )
+            if events is None:
+                return False
+
+        # no-event fast path: a single C-level empty-queue check per tick
+        try:
+            evt = events.get_nowait()
+        except queue.Empty:
             return False
 
-        if force_opaque:
+        if evt == "force_off":
             if self._wrapper is not None:
                 self._wrapper.set_enabled(False)
-            self.env._force_enclosing_walls_opaque = False
-            # If a toggle was also queued, drop it (force-off wins)
-            self.env._toggle_enclosing_walls = False
+            # drop anything queued behind the force-off (force-off wins)
+            while True:
+                try:
+                    events.get_nowait()
+                except queue.Empty:
+                    break
             _refresh_visualization_and_redraw(self.env, render=render)
             return True
 
         # toggle
         if self._wrapper is not None:
             self._wrapper.toggle()
-        self.env._toggle_enclosing_walls = False
         _refresh_visualization_and_redraw(self.env, render=render)
         return True
 
@@ -111,8 +134,24 @@ class EnclosingWallRenderWrapper(Wrapper):
         self.alpha = float(alpha)
         self.enabled = False
         self._geom_ids: Optional[np.ndarray] = None
-        self._saved_alpha: Dict[int, float] = {}
-        self._last_model_ptr = None
+        # computed geom ids keyed by layout_id so soft resets that keep the
+        # compiled model skip the O(nbody + ngeom) scan entirely. Each entry
+        # carries a weakref to the model it was computed for: id() values can
+        # be recycled after a hard reset frees the old model, so a hit only
+        # counts if the referent is still the live model object.
+        self._geom_id_cache: Dict[int, Tuple[weakref.ref, np.ndarray]] = {}
+        # original geom_rgba alphas, saved once per compiled model as a single
+        # fancy-indexed array (no per-geom Python loop / dict boxing)
+        self._saved_alpha_arr: Optional[np.ndarray] = None
+        self._saved_alpha_ids: Optional[np.ndarray] = None
+        # weakref to the last model we applied to (None until first apply);
+        # compared by identity so a recycled address can't alias a new model
+        self._last_model_ref: Optional[weakref.ref] = None
+        # set on state changes so visualize() only re-applies when needed
+        self._dirty = True
+        # attribute names known to live on the wrapped env, so __setattr__ can
+        # forward without a hasattr() walk down the wrapper chain on every set
+        self._forward_names = frozenset(dir(self.env))
         self.set_enabled(bool(enabled))
 
     def __setattr__(self, name, value):
@@ -123,6 +162,11 @@ class EnclosingWallRenderWrapper(Wrapper):
             object.__setattr__(self, name, value)
             return
 
+        fwd = self.__dict__.get("_forward_names")
+        if fwd is not None and name in fwd:
+            setattr(self.__dict__["env"], name, value)
+            return
+
         if "env" in self.__dict__ and hasattr(self.__dict__["env"], name):
             setattr(self.__dict__["env"], name, value)
             return
@@ -137,22 +181,36 @@ class EnclosingWallRenderWrapper(Wrapper):
         if enabled == self.enabled:
             return
         self.enabled = enabled
+        self._dirty = True
         self._apply_or_restore()
 
     def visualize(self, vis_settings):
         """
         Delegates visualization to the wrapped env, then applies / restores the enclosing-wall
         transparency override. This keeps wrapper-specific rendering logic out of the base env.
+        The re-apply is skipped when nothing changed since the last call (no state change and
+        same compiled model), making repeated visualize calls near-free.
         """
         self.env.visualize(vis_settings)
-        self._apply_or_restore()
+        base = _unwrap_env(self.env)
+        model = getattr(getattr(base, "sim", None), "model", None)
+        last_model = (
+            self._last_model_ref() if self._last_model_ref is not None else None
+        )
+        if self._dirty or (model is not None and model is not last_model):
+            self._apply_or_restore()
+            self._dirty = False
 
     def reset(self, *args, **kwargs):
-        # Reset underlying env first, then refresh geom ids for the new model and re-apply if needed
+        # Reset underlying env first, then re-apply if needed. Hard resets
+        # (model reloads) are detected via the model-identity check inside
+        # _apply_or_restore; the geom-id cache lets soft resets reuse the
+        # previously computed ids for the same compiled model.
+        # Saved alphas are intentionally kept across soft resets: the model
+        # (and thus the true original alphas) is unchanged, and re-saving here
+        # would capture our own override as the "original".
         ret = self.env.reset(*args, **kwargs)
-        self._geom_ids = None
-        self._saved_alpha = {}
-        self._last_model_ptr = None
+        self._dirty = True
         if self.enabled:
             self._apply_or_restore()
         return ret
@@ -166,38 +224,50 @@ class EnclosingWallRenderWrapper(Wrapper):
         if model is None:
             return
 
-        # detect model reloads (hard resets) so we don't reuse stale ids / alpha
-        model_ptr = id(model)
-        if self._last_model_ptr != model_ptr:
+        # detect model reloads (hard resets) so we don't reuse stale ids / alpha;
+        # identity is tracked through a weakref because a freed model's address
+        # (and thus its id()) can be recycled by the next allocation
+        last_model = (
+            self._last_model_ref() if self._last_model_ref is not None else None
+        )
+        if last_model is not model:
             self._geom_ids = None
-            self._saved_alpha = {}
-            self._last_model_ptr = model_ptr
+            self._saved_alpha_arr = None
+            self._saved_alpha_ids = None
+            self._last_model_ref = weakref.ref(model)
 
         geom_ids = self._get_enclosing_wall_geom_ids()
         if geom_ids.size == 0:
             return
 
         if self.enabled:
-            # save originals once
-            for gi in geom_ids.tolist():
-                if int(gi) not in self._saved_alpha:
-                    self._saved_alpha[int(gi)] = float(model.geom_rgba[int(gi), 3])
+            # save originals once per compiled model (single fancy-index read)
+            if self._saved_alpha_arr is None:
+                self._saved_alpha_ids = geom_ids
+                self._saved_alpha_arr = model.geom_rgba[geom_ids, 3].copy()
             model.geom_rgba[geom_ids, 3] = self.alpha
-        else:
-            # force walls fully opaque when disabled
-            model.geom_rgba[geom_ids, 3] = 1.0
-            self._saved_alpha = {}
+        elif self._saved_alpha_ids is not None:
+            # restore the true original alphas (walls need not be fully opaque)
+            model.geom_rgba[self._saved_alpha_ids, 3] = self._saved_alpha_arr
+            self._saved_alpha_arr = None
+            self._saved_alpha_ids = None
 
     @staticmethod
-    def _get_enclosing_wall_names_from_layout(layout_id: int) -> list[str]:
+    @functools.lru_cache(maxsize=64)
+    def _get_enclosing_wall_names_from_layout(layout_id: int) -> tuple[str, ...]:
+        # Memoized: layout YAML never changes during a run, so repeated resets
+        # should not re-read and re-parse it. Returns a tuple so the cached
+        # value is immutable (and hashable for the cache itself).
         layout_path = SceneRegistry.get_layout_path(layout_id)
         with open(layout_path, "r") as f:
-            layout_data = yaml.safe_load(f) or {}
+            layout_data = yaml.load(f, Loader=_YamlSafeLoader) or {}
         walls = (layout_data.get("room") or {}).get("walls") or []
-        return [w.get("name") for w in walls if w.get("enclosing_wall", False) is True]
+        return tuple(
+            w.get("name") for w in walls if w.get("enclosing_wall", False) is True
+        )
 
     @staticmethod
-    def _match_geom_ids(model, enclosing_names: list[str]) -> np.ndarray:
+    def _match_geom_ids(model, enclosing_names: Sequence[str]) -> np.ndarray:
         """Return MuJoCo geom indices for all geometry belonging to enclosing walls.
 
         Used to know which geoms to make transparent when the wrapper is enabled.
@@ -219,51 +289,46 @@ class EnclosingWallRenderWrapper(Wrapper):
         if not enclosing_names:
             return np.array([], dtype=int)
 
+        # Materialize all names up front: body_id2name / geom_id2name each cross
+        # into MuJoCo per call, which dominates the scan on large scenes.
+        body_names = [model.body_id2name(b) for b in range(model.nbody)]
+        geom_names = [model.geom_id2name(i) for i in range(model.ngeom)]
+
+        # Match rules: exact name, or name used as underscore-separated
+        # prefix/suffix. One compiled regex handles the whole alternation in C,
+        # so each candidate costs a single search() call.
+        alt = "|".join(re.escape(n) for n in enclosing_names)
+        pattern = re.compile(rf"^(?:{alt})$|^(?:{alt})_|_(?:{alt})$")
+
         # Collect bodies that match enclosing wall names (exact or name_prefix_ / _name_suffix)
         body_ids = set()
         for b in range(model.nbody):
-            body_name = model.body_id2name(b)
+            body_name = body_names[b]
             if body_name is None:
                 continue
-            for ename in enclosing_names:
-                if (
-                    body_name == ename
-                    or body_name.startswith(ename + "_")
-                    or body_name.endswith("_" + ename)
-                ):
-                    body_ids.add(b)
-                    break
-
-        # Add all descendant bodies so child bodies/geoms (e.g. sub-meshes) are included
-        added = True
-        while added:
-            added = False
-            for b in range(model.nbody):
-                if b in body_ids:
-                    continue
-                parent = model.body_parentid[b]
-                if parent >= 0 and parent in body_ids:
-                    body_ids.add(b)
-                    added = True
+            if pattern.search(body_name):
+                body_ids.add(b)
+
+        # Add all descendant bodies so child bodies/geoms (e.g. sub-meshes) are
+        # included. Propagate a boolean mask down the parent array; body trees
+        # are shallow, so this converges in a handful of vectorized passes.
+        parents = np.asarray(model.body_parentid)
+        body_mask = np.zeros(model.nbody, dtype=bool)
+        body_mask[list(body_ids)] = True
+        while True:
+            new_mask = body_mask | ((parents >= 0) & body_mask[parents])
+            if np.array_equal(new_mask, body_mask):
+                break
+            body_mask = new_mask
 
         # Geoms: include if attached to a matched body, or if geom name matches an enclosing name
-        geom_ids: list[int] = []
-        for i in range(model.ngeom):
-            if model.geom_bodyid[i] in body_ids:
-                geom_ids.append(i)
-                continue
-            gname = model.geom_id2name(i)
-            if gname is None:
-                continue
-            for ename in enclosing_names:
-                if (
-                    gname == ename
-                    or gname.startswith(ename + "_")
-                    or gname.endswith("_" + ename)
-                ):
-                    geom_ids.append(i)
-                    break
-        return np.array(geom_ids, dtype=int)
+        geom_body_mask = body_mask[np.asarray(model.geom_bodyid)]
+        geom_name_mask = np.fromiter(
+            (g is not None and pattern.search(g) is not None for g in geom_names),
+            dtype=bool,
+            count=model.ngeom,
+        )
+        return np.nonzero(geom_body_mask | geom_name_mask)[0]
 
     def _get_enclosing_wall_geom_ids(self) -> np.ndarray:
         if self._geom_ids is not None:
@@ -278,15 +343,28 @@ class EnclosingWallRenderWrapper(Wrapper):
             self._geom_ids = np.array([], dtype=int)
             return self._geom_ids
 
-        enclosing_names = self._get_enclosing_wall_names_from_layout(
-            int(base.layout_id)
-        )
         model = getattr(base.sim, "model", None)
         if model is None:
             self._geom_ids = np.array([], dtype=int)
             return self._geom_ids
 
+        key = int(base.layout_id)
+        entry = self._geom_id_cache.get(key)
+        if entry is not None:
+            model_ref, cached = entry
+            # a hit is only valid if the entry's model is still the live one
+            if model_ref() is model:
+                self._geom_ids = cached
+                return cached
+
+        enclosing_names = self._get_enclosing_wall_names_from_layout(
+            int(base.layout_id)
+        )
         self._geom_ids = self._match_geom_ids(model, enclosing_names)
+        self._geom_id_cache[key] = (weakref.ref(model), self._geom_ids)
+        # bound memory: keep only the most recent handful of compiled models
+        while len(self._geom_id_cache) > 8:
+            self._geom_id_cache.pop(next(iter(self._geom_id_cache)))
         return self._geom_ids
 
 
@@ -304,15 +382,14 @@ def install_enclosing_wall_hotkeys(env):
     if getattr(env, "_enclosing_wall_key_listener", None) is not None:
         return
 
-    env._toggle_enclosing_walls = False
-    env._force_enclosing_walls_opaque = False
+    env._enclosing_wall_events = queue.SimpleQueue()
 
     def _on_release(key):
         if key == Key.esc:
-            env._toggle_enclosing_walls = True
+            env._enclosing_wall_events.put("toggle")
             return
         if hasattr(key, "char") and key.char in {"[", "]"}:
-            env._force_enclosing_walls_opaque = True
+            env._enclosing_wall_events.put("force_off")
             return
 
     env._enclosing_wall_key_listener = Listener(on_release=_on_release)